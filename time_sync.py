@@ -1,13 +1,21 @@
 import local_config as config
+import asyncio
+import atexit
 import datetime
+import queue
+import socket
+import threading
 import time
 import logging
-from logging.handlers import RotatingFileHandler
-from pickledb import PickleDB
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
 from zk import ZK, const
 import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
 
 # Time sync configuration
@@ -15,267 +23,542 @@ TIME_SYNC_FREQUENCY = getattr(config, 'TIME_SYNC_FREQUENCY', 1)  # Default: 1 mi
 TIME_TOLERANCE_SECONDS = getattr(config, 'TIME_TOLERANCE_SECONDS', 60)  # Sync if difference > 1 minute
 ENABLE_TIME_SYNC = getattr(config, 'ENABLE_TIME_SYNC', True)  # Enable/disable time sync
 
+# Bounds for the adaptive check interval derived from each device's drift rate
+MIN_SYNC_INTERVAL = getattr(config, 'TIME_SYNC_MIN_INTERVAL', 60)  # seconds
+MAX_SYNC_INTERVAL = getattr(config, 'TIME_SYNC_MAX_INTERVAL', 3600)  # seconds
+
+# Drifts at most this far above tolerance are corrected without the
+# disable/enable cycle (i.e. fast path for drift < tolerance + this margin)
+SMALL_DRIFT_SECONDS = getattr(config, 'TIME_SYNC_SMALL_DRIFT_SECONDS', 30)
+
 # Google Chat webhook configuration - read from config file
 GOOGLE_CHAT_WEBHOOK = getattr(config, 'GOOGLE_CHAT_WEBHOOK', None)
 ENABLE_CHAT_NOTIFICATIONS = getattr(config, 'ENABLE_CHAT_NOTIFICATIONS', True)
 
+# Persistent session so webhook posts reuse one keep-alive TLS connection
+_chat_session = requests.Session()
+_chat_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
+# Notifications are delivered by a background thread so a slow webhook
+# never blocks the sync path; bounded so a dead endpoint cannot grow it
+_chat_queue = queue.Queue(maxsize=256)
+
+# Precomputed message templates and headers shared by every notification
+_CHAT_HEADERS = {
+    'Content-Type': 'application/json; charset=UTF-8'
+}
+_DEVICE_ALERT_TPL = "🔔 **Biometric Device Alert**\n\n" \
+                    "**Device:** {device_id} ({device_ip})\n" \
+                    "**Time:** {timestamp}\n" \
+                    "**Status:** {message}"
+_SYSTEM_ALERT_TPL = "🔔 **Biometric System Alert**\n\n" \
+                    "**Time:** {timestamp}\n" \
+                    "**Status:** {message}"
+
+# Reused encoder producing compact bodies; serializing here bypasses the
+# json.dumps round-trip requests does internally for json= payloads
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _chat_worker():
+    """Drain the notification queue and post each pre-serialized body to Google Chat"""
+    while True:
+        message, body = _chat_queue.get()
+        try:
+            response = _chat_session.post(GOOGLE_CHAT_WEBHOOK, data=body, headers=_CHAT_HEADERS, timeout=10)
+
+            if response.status_code == 200:
+                time_sync_logger.info("Google Chat notification sent successfully: %s", message)
+            else:
+                time_sync_logger.error("Failed to send Google Chat notification. Status: %s, Response: %s", response.status_code, response.text)
+        except Exception as e:
+            time_sync_logger.error("Exception sending Google Chat notification: %s", e)
+        finally:
+            _chat_queue.task_done()
+
+
+# Cache of live ZK connections keyed by device_id, reused across sync cycles
+_conn_pool = {}
+_conn_pool_lock = threading.Lock()
+
+# The status dict is shared across sync worker threads - guard all access
+_status_lock = threading.Lock()
+
+
+def _load_status():
+    """Load the status dict from disk, tolerating a missing or corrupt file"""
+    try:
+        with open(_STATUS_FILE) as status_file:
+            loaded = json.load(status_file)
+    except (OSError, ValueError):
+        loaded = {}
+
+    # Fold legacy flat per-device keys into the nested 'devices' dict
+    devices = loaded.setdefault('devices', {})
+    for suffix, field in (('_online_status', 'online'),
+                          ('_last_time_sync', 'last_sync'),
+                          ('_last_sync_ts', 'last_sync_ts')):
+        for key in [k for k in loaded if k.endswith(suffix)]:
+            devices.setdefault(key[:-len(suffix)], {})[field] = loaded.pop(key)
+
+    return loaded
+
+
+def _device_status(device_id):
+    """Return the mutable per-device status dict (caller must hold _status_lock)"""
+    return _status['devices'].setdefault(device_id, {})
+
+
+def _flush_status():
+    """Atomically persist the in-memory status dict (tmp file + rename)"""
+    with _status_lock:
+        snapshot = json.dumps(_status)
+
+    tmp_file = _STATUS_FILE.with_name(_STATUS_FILE.name + '.tmp')
+    with open(tmp_file, 'w') as status_file:
+        status_file.write(snapshot)
+    os.replace(tmp_file, _STATUS_FILE)
+
+
+def _tcp_alive(ip, port=4370, timeout=1.0):
+    """Fast TCP reachability probe - much cheaper than a full ZK handshake"""
+    try:
+        with socket.create_connection((ip, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+async def _probe_async(device, timeout=1.0):
+    """Probe one device's ZK port on the event loop, returning (device_id, alive)"""
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(device['ip'], 4370), timeout=timeout)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return device['device_id'], True
+    except (OSError, asyncio.TimeoutError):
+        return device['device_id'], False
+
+
+async def _probe_all_async(devices):
+    return await asyncio.gather(*(_probe_async(device) for device in devices))
+
+
+def _probe_all(devices):
+    """TCP-probe all devices concurrently in a single thread
+
+    Returns the set of device_ids that answered, so even a large fleet of
+    mostly-offline devices is classified in ~1s total rather than 1s each.
+    """
+    return {device_id for device_id, alive in asyncio.run(_probe_all_async(devices)) if alive}
+
+
+def _get_conn(device, port=4370, timeout=30):
+    """Get a cached connected ZK instance for the device, reconnecting if the cached one is dead
+
+    The lock only guards the pool dict itself - the health check and the
+    (potentially slow) connect happen outside it so workers syncing
+    different devices never serialize on each other's network I/O.
+    """
+    device_id = device['device_id']
+    device_ip = device['ip']
+
+    with _conn_pool_lock:
+        conn = _conn_pool.get(device_id)
+
+    if conn:
+        try:
+            if conn.helper.test_ping():
+                return conn
+        except Exception:
+            pass
+        # Cached connection is stale - drop it and reconnect below
+        _evict_conn(device_id)
+
+    conn = ZK(device_ip, port=port, timeout=timeout).connect()
+    with _conn_pool_lock:
+        _conn_pool[device_id] = conn
+    return conn
+
+
+def _evict_conn(device_id):
+    """Drop a pooled connection after a failure so the next call reconnects"""
+    with _conn_pool_lock:
+        conn = _conn_pool.pop(device_id, None)
+
+    if conn:
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+
+def _drain_conn_pool():
+    """Disconnect all pooled connections on shutdown"""
+    with _conn_pool_lock:
+        conns = list(_conn_pool.values())
+        _conn_pool.clear()
+
+    for conn in conns:
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+
+atexit.register(_drain_conn_pool)
+
 
 def setup_time_sync_logger(name, log_file, level=logging.INFO):
-    """Setup logger for time sync operations"""
+    """Setup logger for time sync operations with non-blocking file I/O"""
     formatter = logging.Formatter('%(asctime)s\t%(levelname)s\t%(message)s')
-    
+
     handler = RotatingFileHandler(log_file, maxBytes=10000000, backupCount=10)
     handler.setFormatter(formatter)
-    
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
     if not logger.hasHandlers():
-        logger.addHandler(handler)
-    
+        # Sync threads only enqueue records; the rotating-file write happens
+        # on the listener's background thread
+        log_queue = queue.Queue(-1)
+        logger.addHandler(QueueHandler(log_queue))
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)
+
     return logger
 
 
 def send_google_chat_message(message, device_id=None, device_ip=None):
-    """Send notification to Google Chat webhook"""
+    """Queue a notification for the Google Chat webhook (delivered asynchronously)"""
     if not ENABLE_CHAT_NOTIFICATIONS or not GOOGLE_CHAT_WEBHOOK:
         return False
-    
-    if not GOOGLE_CHAT_WEBHOOK:
-        time_sync_logger.warning("Google Chat notifications are enabled but GOOGLE_CHAT_WEBHOOK is not configured in local_config.py")
-        return False
-    
+
+    # Create rich message with device details
+    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    if device_id and device_ip:
+        full_message = _DEVICE_ALERT_TPL.format(
+            device_id=device_id, device_ip=device_ip, timestamp=timestamp, message=message)
+    else:
+        full_message = _SYSTEM_ALERT_TPL.format(timestamp=timestamp, message=message)
+
+    body = _json_encoder.encode({"text": full_message}).encode('utf-8')
+
     try:
-        # Create rich message with device details
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        if device_id and device_ip:
-            full_message = f"🔔 **Biometric Device Alert**\n\n" \
-                          f"**Device:** {device_id} ({device_ip})\n" \
-                          f"**Time:** {timestamp}\n" \
-                          f"**Status:** {message}"
-        else:
-            full_message = f"🔔 **Biometric System Alert**\n\n" \
-                          f"**Time:** {timestamp}\n" \
-                          f"**Status:** {message}"
-        
-        payload = {
-            "text": full_message
-        }
-        
-        headers = {
-            'Content-Type': 'application/json; charset=UTF-8'
-        }
-        
-        response = requests.post(GOOGLE_CHAT_WEBHOOK, json=payload, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            time_sync_logger.info(f"Google Chat notification sent successfully: {message}")
-            return True
-        else:
-            time_sync_logger.error(f"Failed to send Google Chat notification. Status: {response.status_code}, Response: {response.text}")
-            return False
-            
-    except Exception as e:
-        time_sync_logger.error(f"Exception sending Google Chat notification: {str(e)}")
+        _chat_queue.put_nowait((message, body))
+        return True
+    except queue.Full:
+        time_sync_logger.warning("Google Chat notification queue is full - dropping: %s", message)
         return False
 
 
-def check_device_online_status(device):
-    """Check if device is online and handle status changes"""
+def check_device_online_status(device, tcp_ok=None, transitions=None):
+    """Check if device is online and handle status changes
+
+    tcp_ok carries the result of an earlier TCP probe (e.g. the cycle-wide
+    async probe in sync_all_devices); when None, a probe is done here.
+    When transitions is a list, state changes are appended to it for one
+    coalesced notification per cycle instead of one webhook per device.
+    Returns the pooled connection when the device is online, None otherwise,
+    so callers can reuse the session without a second health check.
+    """
     device_id = device['device_id']
     device_ip = device['ip']
-    status_key = f'{device_id}_online_status'
-    
+    log = time_sync_logger
+
     try:
-        # Try to connect to device with short timeout
-        zk = ZK(device_ip, port=4370, timeout=5)
-        conn = zk.connect()
-        conn.disconnect()
-        
+        # Cheap TCP probe first so powered-off devices fail fast instead of
+        # waiting out the full ZK handshake timeout
+        if tcp_ok is None:
+            tcp_ok = _tcp_alive(device_ip)
+        if not tcp_ok:
+            raise ConnectionError(f"TCP probe to {device_ip}:4370 failed")
+
+        # Device answers on the ZK port - establish/reuse the pooled connection
+        conn = _get_conn(device, timeout=5)
+
         # Device is online
-        previous_status = status.get(status_key)
-        
+        with _status_lock:
+            previous_status = _device_status(device_id).get('online')
+
         if previous_status == 'offline' or previous_status is None:
             # Device came back online or first check
             if previous_status == 'offline':
-                send_google_chat_message(
-                    "✅ Device is back ONLINE", 
-                    device_id, 
-                    device_ip
-                )
-                time_sync_logger.info(f"Device {device_id} ({device_ip}): Came back ONLINE")
+                if transitions is not None:
+                    transitions.append((device_id, device_ip, 'online'))
+                else:
+                    send_google_chat_message(
+                        "✅ Device is back ONLINE",
+                        device_id,
+                        device_ip
+                    )
+                log.info("Device %s (%s): Came back ONLINE", device_id, device_ip)
             
-            status.set(status_key, 'online')
-            status.save()
-        
-        return True
-        
+            with _status_lock:
+                _device_status(device_id)['online'] = 'online'
+
+        return conn
+
     except Exception as e:
         # Device is offline
-        previous_status = status.get(status_key)
+        _evict_conn(device_id)
+        with _status_lock:
+            previous_status = _device_status(device_id).get('online')
         
         if previous_status != 'offline':
             # Device went offline
-            send_google_chat_message(
-                "❌ Device is OFFLINE", 
-                device_id, 
-                device_ip
-            )
-            time_sync_logger.warning(f"Device {device_id} ({device_ip}): Went OFFLINE - {str(e)}")
+            if transitions is not None:
+                transitions.append((device_id, device_ip, 'offline'))
+            else:
+                send_google_chat_message(
+                    "❌ Device is OFFLINE",
+                    device_id,
+                    device_ip
+                )
+            log.warning("Device %s (%s): Went OFFLINE - %s", device_id, device_ip, e)
             
-            status.set(status_key, 'offline')
-            status.save()
-        
-        return False
+            with _status_lock:
+                _device_status(device_id)['online'] = 'offline'
+
+        return None
 
 
-def get_device_time(ip, port=4370, timeout=30):
+def get_device_time(device, port=4370, timeout=30):
     """Get current time from biometric device"""
-    zk = ZK(ip, port=port, timeout=timeout)
-    conn = None
+    device_ip = device['ip']
     device_time = None
-    
+
     try:
-        conn = zk.connect()
+        conn = _get_conn(device, port=port, timeout=timeout)
         device_time = conn.get_time()
-        time_sync_logger.info(f"Device {ip}: Current time retrieved - {device_time}")
+        time_sync_logger.info("Device %s: Current time retrieved - %s", device_ip, device_time)
     except Exception as e:
-        time_sync_logger.error(f"Device {ip}: Failed to get time - {str(e)}")
+        time_sync_logger.error("Device %s: Failed to get time - %s", device_ip, e)
+        _evict_conn(device['device_id'])
         raise
-    finally:
-        if conn:
-            conn.disconnect()
-    
+
     return device_time
 
 
-def set_device_time(ip, new_time, port=4370, timeout=30):
-    """Set time on biometric device"""
-    zk = ZK(ip, port=port, timeout=timeout)
-    conn = None
-    success = False
-    
-    try:
-        conn = zk.connect()
-        
-        # Disable device before setting time
-        disable_result = conn.disable_device()
-        time_sync_logger.info(f"Device {ip}: Disable attempted - {disable_result}")
-        
-        # Set the new time
-        set_result = conn.set_time(new_time)
-        time_sync_logger.info(f"Device {ip}: Time set to {new_time} - Result: {set_result}")
-        
-        # Enable device after setting time
-        enable_result = conn.enable_device()
-        time_sync_logger.info(f"Device {ip}: Enable attempted - {enable_result}")
-        
-        success = True
-        
-    except Exception as e:
-        time_sync_logger.error(f"Device {ip}: Failed to set time - {str(e)}")
-        raise
-    finally:
-        if conn:
-            conn.disconnect()
-    
-    return success
+def _next_check_interval(device_id, time_diff):
+    """Estimate how long until this device needs checking again from its drift rate"""
+    with _status_lock:
+        last_sync_ts = _device_status(device_id).get('last_sync_ts')
+
+    if last_sync_ts:
+        elapsed = time.time() - float(last_sync_ts)
+        if elapsed > 0 and time_diff > 0:
+            drift_rate = time_diff / elapsed  # seconds of drift per second
+            # Check again when the device is expected to be halfway to tolerance
+            next_check = TIME_TOLERANCE_SECONDS / (2 * drift_rate)
+            return min(MAX_SYNC_INTERVAL, max(MIN_SYNC_INTERVAL, next_check))
+
+    # No drift baseline yet - keep checking at the minimum interval
+    return MIN_SYNC_INTERVAL
+
+
+def _tiered_set_time(conn, new_time, drift):
+    """Set the device clock, skipping disable/enable for small corrections
+
+    Syncing only starts above TIME_TOLERANCE_SECONDS, so the fast path
+    covers drifts up to SMALL_DRIFT_SECONDS beyond that: corrections only
+    slightly past tolerance are accepted by the devices without disabling,
+    saving two protocol round-trips and avoiding briefly locking out users
+    mid-punch. Returns True when the fast path was taken.
+    """
+    if drift < TIME_TOLERANCE_SECONDS + SMALL_DRIFT_SECONDS:
+        conn.set_time(new_time)
+        return True
+
+    # Large correction - keep the conservative disable/set/enable sequence
+    conn.disable_device()
+    conn.set_time(new_time)
+    conn.enable_device()
+    return False
 
 
-def sync_device_time(device):
-    """Synchronize time for a single device"""
+def sync_device_time(device, conn, system_time):
+    """Synchronize time for a single device over an already-open connection
+
+    system_time is the cycle timestamp captured once in sync_all_devices, so
+    every device in a cycle is compared against the same reference.
+    Returns (success, next_check) where next_check is the recommended number
+    of seconds until this device needs another check.
+    """
+    # Bind hot globals and lookups to locals - this path runs per device per cycle
     device_ip = device['ip']
     device_id = device['device_id']
-    
-    # First check if device is online
-    if not check_device_online_status(device):
-        return False
-    
+    log = time_sync_logger
+    tolerance = TIME_TOLERANCE_SECONDS
+
     try:
-        # Get current system time
-        system_time = datetime.datetime.now()
-        
-        # Get device time
-        device_time = get_device_time(device_ip)
-        
+        # Get device time on the same session used for the online check
+        device_time = conn.get_time()
+
         if device_time:
-            # Calculate time difference
-            time_diff = abs((system_time - device_time).total_seconds())
-            
-            time_sync_logger.debug(f"Device {device_id} ({device_ip}): Time difference - {time_diff:.2f} seconds")
-            
-            if time_diff > TIME_TOLERANCE_SECONDS:
-                time_sync_logger.warning(f"Device {device_id} ({device_ip}): Time difference exceeds tolerance ({TIME_TOLERANCE_SECONDS}s) - Syncing...")
-                
-                # Set device time to system time
-                if set_device_time(device_ip, system_time):
-                    time_sync_logger.info(f"Device {device_id} ({device_ip}): Time synchronized successfully")
-                    
-                    # Send notification for significant time corrections
-                    if time_diff > 300:  # 5 minutes
-                        send_google_chat_message(
-                            f"⏰ Time synchronized (difference was {time_diff:.0f} seconds)", 
-                            device_id, 
-                            device_ip
-                        )
-                    
-                    # Verify the time was set correctly
-                    time.sleep(2)  # Small delay before verification
-                    updated_device_time = get_device_time(device_ip)
-                    if updated_device_time:
-                        verification_diff = abs((system_time - updated_device_time).total_seconds())
-                        if verification_diff <= TIME_TOLERANCE_SECONDS:
-                            time_sync_logger.info(f"Device {device_id} ({device_ip}): Time sync verification successful")
-                            return True
-                        else:
-                            time_sync_logger.error(f"Device {device_id} ({device_ip}): Time sync verification failed - difference: {verification_diff:.2f}s")
-                            return False
-                else:
-                    time_sync_logger.error(f"Device {device_id} ({device_ip}): Failed to synchronize time")
-                    return False
+            # Calculate time difference as plain float seconds
+            time_diff = abs(system_time.timestamp() - device_time.timestamp())
+
+            log.debug("Device %s (%s): Time difference - %.2f seconds", device_id, device_ip, time_diff)
+
+            next_check = _next_check_interval(device_id, time_diff)
+
+            if time_diff > tolerance:
+                log.warning("Device %s (%s): Time difference exceeds tolerance (%ss) - Syncing...", device_id, device_ip, tolerance)
+
+                # Set the clock on the same session, sized to the drift
+                small_correction = _tiered_set_time(conn, system_time, time_diff)
+                log.info("Device %s (%s): Time set to %s", device_id, device_ip, system_time)
+
+                # Send notification for significant time corrections
+                if time_diff > 300:  # 5 minutes
+                    send_google_chat_message(
+                        f"⏰ Time synchronized (difference was {time_diff:.0f} seconds)",
+                        device_id,
+                        device_ip
+                    )
+
+                if small_correction:
+                    # Fast path took 1 RTT; trust it and skip the verification read
+                    with _status_lock:
+                        _device_status(device_id)['last_sync_ts'] = time.time()
+                    return True, next_check
+
+                # Verify the time was set correctly - same session, so no settle delay needed
+                updated_device_time = conn.get_time()
+                if updated_device_time:
+                    # One fresh timestamp so the verification diff is not biased
+                    # by however long the set took
+                    verification_diff = abs(time.time() - updated_device_time.timestamp())
+                    if verification_diff <= tolerance:
+                        log.info("Device %s (%s): Time sync verification successful", device_id, device_ip)
+                        # Clock was just reset - this is the new drift baseline
+                        with _status_lock:
+                            _device_status(device_id)['last_sync_ts'] = time.time()
+                        return True, next_check
+                    else:
+                        log.error("Device %s (%s): Time sync verification failed - difference: %.2fs", device_id, device_ip, verification_diff)
+                        return False, MIN_SYNC_INTERVAL
+                return False, MIN_SYNC_INTERVAL
             else:
-                time_sync_logger.debug(f"Device {device_id} ({device_ip}): Time is within tolerance, no sync needed")
-                return True
+                log.debug("Device %s (%s): Time is within tolerance, no sync needed", device_id, device_ip)
+                with _status_lock:
+                    # Establish a drift baseline on first observation
+                    if not _device_status(device_id).get('last_sync_ts'):
+                        _device_status(device_id)['last_sync_ts'] = time.time()
+                return True, next_check
         else:
-            time_sync_logger.error(f"Device {device_id} ({device_ip}): Could not retrieve device time")
-            return False
-            
+            log.error("Device %s (%s): Could not retrieve device time", device_id, device_ip)
+            return False, MIN_SYNC_INTERVAL
+
     except Exception as e:
-        time_sync_logger.error(f"Device {device_id} ({device_ip}): Exception during time sync - {str(e)}")
-        return False
+        log.error("Device %s (%s): Exception during time sync - %s", device_id, device_ip, e)
+        _evict_conn(device_id)
+        return False, MIN_SYNC_INTERVAL
+
+
+def _send_transition_summary(transitions):
+    """Send one coalesced notification covering all state changes in a cycle"""
+    offline = [f"{device_id} ({device_ip})" for device_id, device_ip, state in transitions if state == 'offline']
+    online = [f"{device_id} ({device_ip})" for device_id, device_ip, state in transitions if state == 'online']
+
+    parts = []
+    if offline:
+        parts.append(f"❌ {len(offline)} device(s) went OFFLINE: {', '.join(offline)}")
+    if online:
+        parts.append(f"✅ {len(online)} device(s) came back ONLINE: {', '.join(online)}")
+
+    if parts:
+        send_google_chat_message("\n".join(parts))
+
+
+def _sync_one(device, cycle_start, reachable=None, transitions=None):
+    """Check and sync a single device, returning (online, synced, next_check)
+
+    reachable is the set of device_ids that answered the cycle's async TCP
+    probe; None means no probe ran and the online check does its own.
+    """
+    device_id = device['device_id']
+
+    try:
+        tcp_ok = None if reachable is None else device_id in reachable
+
+        # Check if device is online first; reuse the session it pooled
+        conn = check_device_online_status(device, tcp_ok, transitions)
+        if conn:
+            synced, next_check = sync_device_time(device, conn, cycle_start)
+            if synced:
+                # Update status with last sync timestamp
+                with _status_lock:
+                    _device_status(device_id)['last_sync'] = str(cycle_start)
+            return True, synced, next_check
+    except Exception as e:
+        time_sync_logger.error("Unexpected error syncing device %s: %s", device_id, e)
+    return False, False, MIN_SYNC_INTERVAL
 
 
 def sync_all_devices():
-    """Synchronize time for all configured devices"""
+    """Synchronize time for all configured devices
+
+    Returns the number of seconds until any device next needs checking.
+    """
     if not ENABLE_TIME_SYNC:
         time_sync_logger.debug("Time sync is disabled in configuration")
-        return
-    
+        return MIN_SYNC_INTERVAL
+
     time_sync_logger.debug("Starting time synchronization check for all devices")
-    
-    success_count = 0
-    online_count = 0
+
     total_devices = len(config.devices)
-    
-    for device in config.devices:
-        try:
-            # Check if device is online first
-            if check_device_online_status(device):
-                online_count += 1
-                if sync_device_time(device):
-                    success_count += 1
-                    # Update status with last sync timestamp
-                    status.set(f'{device["device_id"]}_last_time_sync', str(datetime.datetime.now()))
-                    status.save()
-        except Exception as e:
-            time_sync_logger.error(f"Unexpected error syncing device {device['device_id']}: {str(e)}")
-    
-    if success_count > 0 or online_count != total_devices:
-        time_sync_logger.info(f"Time sync completed: {success_count}/{online_count} online devices synchronized successfully ({online_count}/{total_devices} devices online)")
-    
-    # Update global last sync timestamp
-    status.set('last_time_sync_run', str(datetime.datetime.now()))
-    status.save()
+    if not total_devices:
+        return MIN_SYNC_INTERVAL
+
+    # One timestamp for the whole cycle - every device diff uses the same reference
+    cycle_start = datetime.datetime.now()
+
+    next_wake = MIN_SYNC_INTERVAL
+    try:
+        # Classify the whole fleet with one single-threaded async probe pass,
+        # then only reachable devices go through the blocking ZK path
+        reachable = _probe_all(config.devices)
+
+        # State changes collected here so the cycle sends one summary webhook
+        # instead of one message per flapping device (list.append is atomic)
+        transitions = []
+
+        # Device I/O is independent and network-bound, so sync devices in parallel
+        with ThreadPoolExecutor(max_workers=min(32, total_devices)) as executor:
+            results = list(executor.map(
+                partial(_sync_one, cycle_start=cycle_start, reachable=reachable,
+                        transitions=transitions),
+                config.devices))
+
+        _send_transition_summary(transitions)
+
+        online_count = sum(1 for online, _, _ in results if online)
+        success_count = sum(1 for _, synced, _ in results if synced)
+        next_wake = min(next_check for _, _, next_check in results)
+
+        if success_count > 0 or online_count != total_devices:
+            time_sync_logger.info("Time sync completed: %s/%s online devices synchronized successfully (%s/%s devices online)", success_count, online_count, online_count, total_devices)
+
+        # Update global last sync timestamp
+        with _status_lock:
+            _status['last_time_sync_run'] = str(cycle_start)
+    finally:
+        # Persist all status mutations with a single atomic write per cycle
+        _flush_status()
+
+    return next_wake
 
 
 def should_run_time_sync():
@@ -289,19 +572,23 @@ def should_run_time_sync():
 
 
 def main_time_sync():
-    """Main function for time synchronization"""
+    """Main function for time synchronization
+
+    Returns the recommended sleep time until the next sync cycle.
+    """
     try:
-        sync_all_devices()
+        return sync_all_devices()
     except Exception as e:
-        time_sync_logger.error(f"Exception in main_time_sync: {str(e)}")
+        time_sync_logger.error("Exception in main_time_sync: %s", e)
+        return MIN_SYNC_INTERVAL
 
 
-def time_sync_service(sleep_time=60):  # Check every 1 minute for continuous sync
-    """Run time sync service in a loop"""
+def time_sync_service(sleep_time=MIN_SYNC_INTERVAL):
+    """Run time sync service in a loop, sleeping based on observed device drift"""
     print("Continuous Time Sync Service Starting...")
     time_sync_logger.info("Continuous Time Sync Service Started")
-    print(f"Time tolerance: {TIME_TOLERANCE_SECONDS} seconds (1 minute)")
-    print(f"Check interval: {sleep_time} seconds")
+    print(f"Time tolerance: {TIME_TOLERANCE_SECONDS} seconds")
+    print(f"Check interval: {MIN_SYNC_INTERVAL}-{MAX_SYNC_INTERVAL} seconds (adaptive)")
     print(f"Google Chat notifications: {'Enabled' if ENABLE_CHAT_NOTIFICATIONS else 'Disabled'}")
     
     # Send startup notification
@@ -311,30 +598,37 @@ def time_sync_service(sleep_time=60):  # Check every 1 minute for continuous syn
     
     while True:
         try:
-            main_time_sync()
-            time.sleep(sleep_time)  # Check every minute
+            sleep_time = main_time_sync() or MIN_SYNC_INTERVAL
+            time_sync_logger.debug("Next time sync check in %.0f seconds", sleep_time)
+            time.sleep(sleep_time)
         except KeyboardInterrupt:
             time_sync_logger.info("Time Sync Service stopped by user")
             print("Time Sync Service stopped")
             if ENABLE_CHAT_NOTIFICATIONS:
                 send_google_chat_message("⏹️ Biometric Time Sync Service Stopped")
+                _chat_queue.join()  # flush pending notifications before exiting
             break
         except Exception as e:
-            time_sync_logger.error(f"Unexpected error in time sync service: {str(e)}")
+            time_sync_logger.error("Unexpected error in time sync service: %s", e)
             print(f"Error in time sync service: {str(e)}")
             time.sleep(sleep_time)
 
 
 # Initialize logging and status
-if not os.path.exists(config.LOGS_DIRECTORY):
-    os.makedirs(config.LOGS_DIRECTORY)
+_LOGS_DIR = Path(config.LOGS_DIRECTORY)
+_LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 time_sync_logger = setup_time_sync_logger(
-    'time_sync_logger', 
-    os.path.join(config.LOGS_DIRECTORY, 'time_sync.log')
+    'time_sync_logger',
+    _LOGS_DIR / 'time_sync.log'
 )
 
-status = PickleDB(os.path.join(config.LOGS_DIRECTORY, 'status.json'))
+_STATUS_FILE = _LOGS_DIR / 'status.json'
+_status = _load_status()
+atexit.register(_flush_status)
+
+_chat_worker_thread = threading.Thread(target=_chat_worker, name='chat-notifications', daemon=True)
+_chat_worker_thread.start()
 
 
 if __name__ == "__main__":
@@ -345,6 +639,7 @@ if __name__ == "__main__":
             # Run sync once and exit
             print("Running one-time sync...")
             sync_all_devices()
+            _chat_queue.join()  # flush pending notifications before exiting
             print("Sync completed")
         elif sys.argv[1] == "check":
             # Check time on all devices without syncing
@@ -356,9 +651,9 @@ if __name__ == "__main__":
                     # Check if device is online
                     if check_device_online_status(device):
                         print("  Status: ONLINE ✅")
-                        device_time = get_device_time(device['ip'])
+                        device_time = get_device_time(device)
                         system_time = datetime.datetime.now()
-                        diff = abs((system_time - device_time).total_seconds()) if device_time else None
+                        diff = abs(system_time.timestamp() - device_time.timestamp()) if device_time else None
                         print(f"  Device Time: {device_time}")
                         print(f"  System Time: {system_time}")
                         print(f"  Difference: {diff:.2f} seconds" if diff else "  Difference: Unable to calculate")
@@ -374,6 +669,8 @@ if __name__ == "__main__":
             # Test Google Chat notification
             print("Testing Google Chat notification...")
             success = send_google_chat_message("🧪 Test notification from Biometric Time Sync Service")
+            if success:
+                _chat_queue.join()  # wait for the background worker to deliver it
             print(f"Notification sent: {'✅ Success' if success else '❌ Failed'}")
         else:
             print("Usage:")